@@ -5,6 +5,8 @@ Flask application factory with MVC structure.
 from flask import Flask
 from config import AppConfig
 from app.controllers.user_controller import UserController
+from app.controllers.profile_controller import ProfileController
+from app.profiler import RequestProfiler
 from app.migrations.migration_manager import MigrationManager
 
 
@@ -25,16 +27,21 @@ def create_app():
     # Configure file upload settings
     app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB max file size
     
-    # Initialize controller
+    # Attach the request profiler (no-op unless PROFILER_ENABLED)
+    profiler = RequestProfiler(app)
+    app.extensions['profiler'] = profiler
+    
+    # Initialize controllers
     user_controller = UserController()
+    profile_controller = ProfileController(profiler)
     
     # Register routes
-    register_routes(app, user_controller)
+    register_routes(app, user_controller, profile_controller)
     
     return app
 
 
-def register_routes(app, user_controller):
+def register_routes(app, user_controller, profile_controller):
     """Register all application routes."""
     
     @app.route("/", methods=["GET"])
@@ -106,3 +113,13 @@ def register_routes(app, user_controller):
     def admin_users_delete(user_id):
         """Delete a user by id."""
         return user_controller.delete(user_id)
+    
+    @app.route("/admin/profiles", methods=["GET"])
+    def admin_profiles():
+        """List recent request profiles per route."""
+        return profile_controller.index()
+    
+    @app.route("/admin/profiles/<route>/<filename>", methods=["GET"])
+    def admin_profiles_download(route, filename):
+        """Download a collapsed-stack profile."""
+        return profile_controller.download(route, filename)
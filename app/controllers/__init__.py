@@ -3,5 +3,6 @@ Controllers package for handling business logic.
 """
 
 from .user_controller import UserController
+from .profile_controller import ProfileController
 
-__all__ = ['UserController']
+__all__ = ['UserController', 'ProfileController']
@@ -0,0 +1,26 @@
+"""
+Profile Controller for browsing recorded request profiles.
+"""
+
+import os
+from flask import abort, render_template, send_from_directory
+
+
+class ProfileController:
+    """Controller for request profiler output."""
+    
+    def __init__(self, profiler):
+        self.profiler = profiler
+    
+    def index(self):
+        """Display recent profiles grouped by route."""
+        profiles = self.profiler.recent_profiles()
+        return render_template('admin/profiles/list.html', profiles=profiles, profiler=self.profiler)
+    
+    def download(self, route, filename):
+        """Serve a collapsed-stack profile file."""
+        if not filename.endswith('.folded'):
+            abort(404)
+        
+        directory = os.path.abspath(self.profiler.route_dir(route))
+        return send_from_directory(directory, filename, mimetype='text/plain', as_attachment=True)
@@ -7,7 +7,6 @@ import uuid
 from werkzeug.utils import secure_filename
 from flask import request, redirect, url_for, flash, render_template
 from app.models.user import User
-from app.migrations.migration_manager import MigrationManager
 
 
 class UserController:
@@ -37,10 +36,6 @@ class UserController:
     
     def index(self):
         """Display list of users."""
-        # Run migrations to ensure database is up to date
-        migration_manager = MigrationManager()
-        migration_manager.run_migrations()
-        
         users = User.all()
         return render_template('admin/users/list.html', users=users)
     
@@ -4,5 +4,13 @@ Migration system for database schema management.
 
 from .migration_manager import MigrationManager
 from .migrations import create_users_table, add_image_path_column
+from .online import (
+    OnlineMigration, OnlineAlter, ShadowTable, Backfill, CopyRows, Cutover,
+    column_exists, index_exists,
+)
 
-__all__ = ['MigrationManager', 'create_users_table', 'add_image_path_column']
+__all__ = [
+    'MigrationManager', 'create_users_table', 'add_image_path_column',
+    'OnlineMigration', 'OnlineAlter', 'ShadowTable', 'Backfill', 'CopyRows', 'Cutover',
+    'column_exists', 'index_exists',
+]
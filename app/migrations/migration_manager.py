@@ -19,6 +19,8 @@ class MigrationManager:
             "database": AppConfig.DB_NAME,
         }
         self.migrations_table = "migrations"
+        self.checkpoints_table = "migration_checkpoints"
+        self.lock_name = f"{AppConfig.DB_NAME}.migrations"
     
     def get_connection(self):
         """Get database connection."""
@@ -65,6 +67,53 @@ class MigrationManager:
         cursor.close()
         connection.close()
     
+    def create_checkpoints_table(self):
+        """Create table tracking progress of online migrations."""
+        connection = self.get_connection()
+        cursor = connection.cursor()
+        
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS `{self.checkpoints_table}` (
+                `migration` VARCHAR(255) NOT NULL,
+                `step` INT NOT NULL,
+                `position` BIGINT NULL,
+                `updated_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                PRIMARY KEY (`migration`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+        """)
+        
+        connection.commit()
+        cursor.close()
+        connection.close()
+    
+    def get_checkpoint(self, migration_name):
+        """Get (step index, position) saved for an online migration."""
+        connection = self.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute(
+                f"SELECT step, position FROM `{self.checkpoints_table}` WHERE migration = %s",
+                (migration_name,)
+            )
+            result = cursor.fetchone()
+            return (result[0], result[1]) if result else (0, None)
+        finally:
+            cursor.close()
+            connection.close()
+    
+    def save_checkpoint(self, connection, migration_name, step, position):
+        """Save online migration progress in the caller's open transaction."""
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute(
+                f"REPLACE INTO `{self.checkpoints_table}` (migration, step, position) VALUES (%s, %s, %s)",
+                (migration_name, step, position)
+            )
+        finally:
+            cursor.close()
+    
     def get_ran_migrations(self):
         """Get list of already run migrations."""
         connection = self.get_connection()
@@ -109,13 +158,134 @@ class MigrationManager:
             cursor.close()
             connection.close()
     
-    def run_migrations(self):
-        """Run all pending migrations."""
+    def run_online_migration(self, migration_name, migration, batch, progress=None):
+        """Run the steps of an online migration, resuming from its checkpoint."""
+        start_step, position = self.get_checkpoint(migration_name)
+        if start_step or position is not None:
+            print(f"Resuming {migration_name} at step {start_step + 1}")
+        
+        connection = self.get_connection()
+        
+        try:
+            for index, step in enumerate(migration.steps):
+                if index < start_step:
+                    continue
+                
+                # Checkpoints are written in the step's transaction, so a batch
+                # and its checkpoint are committed together.
+                def report(step_position, done, total, index=index, step=step):
+                    self.save_checkpoint(connection, migration_name, index, step_position)
+                    if progress:
+                        progress(migration_name, step.description, done, total)
+                
+                step.run(connection, position if index == start_step else None, report)
+                self.save_checkpoint(connection, migration_name, index + 1, None)
+                connection.commit()
+            
+            # Record the migration and drop its checkpoint atomically, so a
+            # crash cannot leave it neither recorded nor resumable.
+            cursor = connection.cursor()
+            try:
+                cursor.execute(
+                    f"INSERT INTO `{self.migrations_table}` (migration, batch) VALUES (%s, %s)",
+                    (migration_name, batch)
+                )
+                cursor.execute(f"DELETE FROM `{self.checkpoints_table}` WHERE migration = %s", (migration_name,))
+                connection.commit()
+            finally:
+                cursor.close()
+        finally:
+            connection.close()
+    
+    def estimate_migrations(self):
+        """Print pending migrations with duration estimates without running them."""
+        from .migrations import MIGRATIONS
+        from .online import OnlineMigration
+        
+        try:
+            connection = self.get_connection()
+        except RuntimeError:
+            print(f"Database `{self.config['database']}` does not exist yet; all migrations are pending.")
+            for migration_name in MIGRATIONS:
+                print(f"{migration_name}: pending")
+            return
+        
+        ran_migrations = self.get_ran_migrations()
+        pending = [(name, migration) for name, migration in MIGRATIONS.items() if name not in ran_migrations]
+        
+        if not pending:
+            connection.close()
+            print("Nothing to migrate.")
+            return
+        
+        cursor = connection.cursor()
+        
+        try:
+            for migration_name, migration in pending:
+                if isinstance(migration, OnlineMigration):
+                    print(f"{migration_name}: ~{migration.estimate(cursor):.1f}s")
+                    for step in migration.steps:
+                        print(f"    {step.description}: ~{step.estimate(cursor):.1f}s")
+                else:
+                    print(f"{migration_name}: no estimate (single statement migration)")
+        finally:
+            cursor.close()
+            connection.close()
+    
+    def acquire_lock(self, connection):
+        """Take the named lock serializing migration runs across processes."""
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (self.lock_name, AppConfig.MIGRATION_LOCK_TIMEOUT))
+            if cursor.fetchone()[0] != 1:
+                raise RuntimeError("Timed out waiting for another process to finish running migrations.")
+        finally:
+            cursor.close()
+    
+    def release_lock(self, connection):
+        """Release the migrations lock."""
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (self.lock_name,))
+            cursor.fetchone()
+        finally:
+            cursor.close()
+    
+    def run_migrations(self, dry_run=False, progress=None):
+        """Run all pending migrations.
+        
+        With ``dry_run`` nothing is changed; pending migrations are listed
+        with duration estimates instead. ``progress(migration, step, done,
+        total)`` is called as online migrations advance.
+        """
+        if dry_run:
+            self.estimate_migrations()
+            return
+        
         self.ensure_database_exists()
+        
+        # Only one process may migrate at a time; the lock is held by this
+        # connection until it is released or the connection closes.
+        lock_connection = self.get_connection()
+        try:
+            self.acquire_lock(lock_connection)
+            try:
+                self._run_pending_migrations(progress)
+            finally:
+                self.release_lock(lock_connection)
+        finally:
+            lock_connection.close()
+    
+    def _run_pending_migrations(self, progress=None):
+        """Run pending migrations; the caller holds the migrations lock."""
         self.create_migrations_table()
+        self.create_checkpoints_table()
         
         # Import migrations
         from .migrations import MIGRATIONS
+        from .online import OnlineMigration
         
         ran_migrations = self.get_ran_migrations()
         batch = self.get_next_batch()
@@ -123,8 +293,11 @@ class MigrationManager:
         for migration_name, migration_func in MIGRATIONS.items():
             if migration_name not in ran_migrations:
                 print(f"Running migration: {migration_name}")
-                migration_func()
-                self.record_migration(migration_name, batch)
+                if isinstance(migration_func, OnlineMigration):
+                    self.run_online_migration(migration_name, migration_func, batch, progress)
+                else:
+                    migration_func()
+                    self.record_migration(migration_name, batch)
                 print(f"✓ {migration_name} completed")
         
         print("All migrations completed!")
@@ -58,20 +58,24 @@ def add_image_path_column():
         """, (AppConfig.DB_NAME,))
         
         if cursor.fetchone()[0] == 0:
-            cursor.execute("ALTER TABLE `users` ADD COLUMN `image_path` VARCHAR(500) NULL AFTER `password_hash`")
+            # Errors propagate so a failed ALTER is not recorded as migrated
+            cursor.execute(
+                "ALTER TABLE `users` ADD COLUMN `image_path` VARCHAR(500) NULL AFTER `password_hash`, "
+                "ALGORITHM=INPLACE, LOCK=NONE"
+            )
             connection.commit()
             print("Added image_path column to users table")
         else:
             print("image_path column already exists")
-            
-    except Exception as e:
-        print(f"Error adding image_path column: {e}")
     finally:
         cursor.close()
         connection.close()
 
 
 # Migration registry
+#
+# Values are either plain functions or OnlineMigration step sequences for
+# changes to large tables (see app/migrations/online.py).
 MIGRATIONS = {
     "2025_01_05_000001_create_users_table": create_users_table,
     "2025_01_05_000002_add_image_path_to_users": add_image_path_column,
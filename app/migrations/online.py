@@ -0,0 +1,327 @@
+"""
+Online migrations for large tables.
+
+An online migration is a sequence of steps registered in ``MIGRATIONS``
+in place of a plain function::
+
+    "2025_02_01_000001_add_status_to_users": OnlineMigration(
+        ShadowTable("users", "ADD COLUMN `status` VARCHAR(20) NOT NULL DEFAULT 'active'"),
+        CopyRows("users"),
+        Cutover("users"),
+    ),
+    "2025_02_01_000002_index_users_status": OnlineMigration(
+        OnlineAlter(
+            "users", "ADD INDEX `idx_status` (`status`)",
+            applied=lambda cursor: index_exists(cursor, "users", "idx_status"),
+        ),
+    ),
+
+Batched steps save a checkpoint after every batch, so an interrupted
+migration resumes from the last completed batch the next time migrations
+run.
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from config import AppConfig
+
+
+def table_stats(cursor, table):
+    """Return (estimated row count, average row length) for a table."""
+    cursor.execute("""
+        SELECT TABLE_ROWS, AVG_ROW_LENGTH
+        FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = %s
+    """, (table,))
+    row = cursor.fetchone()
+    if not row:
+        return 0, 0
+    return int(row[0] or 0), int(row[1] or 0)
+
+
+def copy_seconds(cursor, table):
+    """Estimate the time to rewrite every row of a table from its data size."""
+    rows, row_length = table_stats(cursor, table)
+    return rows * row_length / AppConfig.MIGRATION_BYTES_PER_SECOND
+
+
+def table_exists(cursor, table):
+    """Check whether a table exists in the current database."""
+    cursor.execute("""
+        SELECT COUNT(*)
+        FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = %s
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def column_exists(cursor, table, column):
+    """Check whether a table has a column."""
+    cursor.execute("""
+        SELECT COUNT(*)
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = %s
+        AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def index_exists(cursor, table, index):
+    """Check whether a table has an index."""
+    cursor.execute("""
+        SELECT COUNT(*)
+        FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = %s
+        AND INDEX_NAME = %s
+    """, (table, index))
+    return cursor.fetchone()[0] > 0
+
+
+def table_columns(cursor, table):
+    """Return the column names of a table in ordinal order."""
+    cursor.execute("""
+        SELECT COLUMN_NAME
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+    """, (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def shadow_name(table):
+    """Name of the shadow copy built for a table."""
+    return f"_{table}_new"
+
+
+def old_name(table):
+    """Name the original table is renamed to at cutover."""
+    return f"_{table}_old"
+
+
+def trigger_names(table):
+    """Names of the insert, update and delete triggers syncing a shadow table."""
+    return [f"{table}_osc_{event}" for event in ("ins", "upd", "del")]
+
+
+class Step(ABC):
+    """A single resumable unit of an online migration."""
+
+    description = "step"
+
+    @abstractmethod
+    def run(self, connection, position, report):
+        """Run the step.
+
+        ``position`` is the checkpoint saved by an interrupted run (or None).
+        ``report(position, done, total)`` writes a new checkpoint in the
+        current transaction and updates progress; commit after calling it
+        so work and checkpoint are saved atomically.
+        """
+
+    def estimate(self, cursor):
+        """Estimated duration of the step in seconds."""
+        return 0.0
+
+
+class OnlineAlter(Step):
+    """ALTER TABLE using the in-place algorithm without locking writes.
+
+    MySQL refuses the statement rather than silently falling back to a
+    locking table copy when the change cannot be done online.
+
+    The server keeps running an ALTER after its client disconnects, so an
+    interrupted step may already be applied when it resumes. ``applied``
+    is a ``callable(cursor)`` reporting whether the change is in place,
+    e.g. ``lambda cursor: column_exists(cursor, "users", "status")``; the
+    ALTER is skipped when it returns True.
+    """
+
+    def __init__(self, table, alteration, applied):
+        self.table = table
+        self.alteration = alteration
+        self.applied = applied
+        self.description = f"alter {table} online"
+
+    def run(self, connection, position, report):
+        cursor = connection.cursor()
+        try:
+            if not self.applied(cursor):
+                cursor.execute(f"ALTER TABLE `{self.table}` {self.alteration}, ALGORITHM=INPLACE, LOCK=NONE")
+                connection.commit()
+        finally:
+            cursor.close()
+        report(None, 1, 1)
+
+    def estimate(self, cursor):
+        if self.applied(cursor):
+            return 0.0
+        return copy_seconds(cursor, self.table)
+
+
+class ShadowTable(Step):
+    """Create an altered copy of a table kept in sync by triggers."""
+
+    def __init__(self, table, alteration, key="id"):
+        self.table = table
+        self.alteration = alteration
+        self.key = key
+        self.description = f"create shadow table for {table}"
+
+    def run(self, connection, position, report):
+        shadow = shadow_name(self.table)
+        cursor = connection.cursor()
+        try:
+            # A previous run may have stopped half way through this step.
+            for trigger in trigger_names(self.table):
+                cursor.execute(f"DROP TRIGGER IF EXISTS `{trigger}`")
+            cursor.execute(f"DROP TABLE IF EXISTS `{shadow}`")
+
+            cursor.execute(f"CREATE TABLE `{shadow}` LIKE `{self.table}`")
+            cursor.execute(f"ALTER TABLE `{shadow}` {self.alteration}")
+
+            shared = [c for c in table_columns(cursor, self.table) if c in table_columns(cursor, shadow)]
+            columns = ", ".join(f"`{c}`" for c in shared)
+            values = ", ".join(f"NEW.`{c}`" for c in shared)
+            insert_trigger, update_trigger, delete_trigger = trigger_names(self.table)
+
+            cursor.execute(f"""
+                CREATE TRIGGER `{insert_trigger}` AFTER INSERT ON `{self.table}` FOR EACH ROW
+                REPLACE INTO `{shadow}` ({columns}) VALUES ({values})
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER `{update_trigger}` AFTER UPDATE ON `{self.table}` FOR EACH ROW
+                REPLACE INTO `{shadow}` ({columns}) VALUES ({values})
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER `{delete_trigger}` AFTER DELETE ON `{self.table}` FOR EACH ROW
+                DELETE FROM `{shadow}` WHERE `{self.key}` = OLD.`{self.key}`
+            """)
+            connection.commit()
+        finally:
+            cursor.close()
+        report(None, 1, 1)
+
+
+class Backfill(Step):
+    """Run a statement over a table in primary key ranges of ``batch_size`` rows.
+
+    ``statement`` must contain two ``%s`` placeholders, bound to the
+    inclusive lower and exclusive upper key of each batch, e.g.
+    ``UPDATE users SET status = 'active' WHERE id >= %s AND id < %s``.
+    Rows inserted after the backfill starts are not revisited, so the
+    application must already write the new data for new rows.
+    """
+
+    def __init__(self, table, statement, batch_size=None, throttle=None, key="id"):
+        self.table = table
+        self.statement = statement
+        self.batch_size = batch_size or AppConfig.MIGRATION_BATCH_SIZE
+        self.throttle = AppConfig.MIGRATION_THROTTLE if throttle is None else throttle
+        self.key = key
+        self.description = f"backfill {table}"
+
+    def get_statement(self, cursor):
+        """Statement executed for each batch."""
+        return self.statement
+
+    def run(self, connection, position, report):
+        cursor = connection.cursor()
+        try:
+            statement = self.get_statement(cursor)
+            cursor.execute(f"SELECT MIN(`{self.key}`), MAX(`{self.key}`) FROM `{self.table}`")
+            lowest, highest = cursor.fetchone()
+            if lowest is None:
+                report(None, 1, 1)
+                return
+
+            total = highest - lowest + 1
+            start = lowest if position is None else max(lowest, position)
+            while start <= highest:
+                # Walk the index to the key batch_size rows ahead, so gaps in
+                # the key space never produce empty batches.
+                cursor.execute(
+                    f"SELECT `{self.key}` FROM `{self.table}` WHERE `{self.key}` >= %s "
+                    f"ORDER BY `{self.key}` LIMIT 1 OFFSET %s",
+                    (start, self.batch_size)
+                )
+                row = cursor.fetchone()
+                end = highest + 1 if row is None or row[0] > highest else row[0]
+
+                cursor.execute(statement, (start, end))
+                report(end, end - lowest, total)
+                connection.commit()
+                start = end
+                if self.throttle and start <= highest:
+                    # Give replication and foreground queries room to breathe.
+                    time.sleep(self.throttle)
+        finally:
+            cursor.close()
+
+    def estimate(self, cursor):
+        rows, _ = table_stats(cursor, self.table)
+        batches = math.ceil(rows / self.batch_size)
+        return copy_seconds(cursor, self.table) + batches * self.throttle
+
+
+class CopyRows(Backfill):
+    """Copy existing rows into the shadow table created by ShadowTable."""
+
+    def __init__(self, table, batch_size=None, throttle=None, key="id"):
+        super().__init__(table, None, batch_size, throttle, key)
+        self.description = f"copy {table} rows to shadow table"
+
+    def get_statement(self, cursor):
+        shadow = shadow_name(self.table)
+        shared = [c for c in table_columns(cursor, self.table) if c in table_columns(cursor, shadow)]
+        columns = ", ".join(f"`{c}`" for c in shared)
+        # Rows the triggers already wrote are newer than the copy; keep them.
+        return (
+            f"INSERT IGNORE INTO `{shadow}` ({columns}) "
+            f"SELECT {columns} FROM `{self.table}` "
+            f"WHERE `{self.key}` >= %s AND `{self.key}` < %s"
+        )
+
+
+class Cutover(Step):
+    """Atomically swap the shadow table in and remove the sync triggers."""
+
+    def __init__(self, table, drop_old=True):
+        self.table = table
+        self.drop_old = drop_old
+        self.description = f"cut over {table}"
+
+    def run(self, connection, position, report):
+        shadow = shadow_name(self.table)
+        cursor = connection.cursor()
+        try:
+            # The rename may already have happened in an interrupted run.
+            if table_exists(cursor, shadow):
+                cursor.execute(
+                    f"RENAME TABLE `{self.table}` TO `{old_name(self.table)}`, "
+                    f"`{shadow}` TO `{self.table}`"
+                )
+            for trigger in trigger_names(self.table):
+                cursor.execute(f"DROP TRIGGER IF EXISTS `{trigger}`")
+            if self.drop_old:
+                cursor.execute(f"DROP TABLE IF EXISTS `{old_name(self.table)}`")
+            connection.commit()
+        finally:
+            cursor.close()
+        report(None, 1, 1)
+
+
+class OnlineMigration:
+    """A migration made of resumable steps."""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+
+    def estimate(self, cursor):
+        """Estimated duration in seconds, from table statistics."""
+        return sum(step.estimate(cursor) for step in self.steps)
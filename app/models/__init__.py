@@ -3,5 +3,6 @@ Models package for database entities.
 """
 
 from .user import User
+from .async_user import AsyncUser
 
-__all__ = ['User']
+__all__ = ['User', 'AsyncUser']
@@ -0,0 +1,124 @@
+"""
+Async data access for the User model.
+
+The blocking ``User`` methods run on a shared thread pool, so async views
+and background jobs can run independent queries concurrently::
+
+    users, total = await AsyncUser.gather(AsyncUser.all(), AsyncUser.count())
+
+A page built from several independent queries then costs roughly the
+latency of its slowest query rather than the sum of all of them.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, List, Optional
+from config import AppConfig
+from app.models.user import User
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide database thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=AppConfig.ASYNC_DB_WORKERS,
+                    thread_name_prefix="async-db",
+                )
+    return _executor
+
+
+def _reset_executor():
+    """Forked workers must not reuse the parent's pool threads."""
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_executor)
+
+
+async def run_in_pool(func, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """Run a blocking call on the database thread pool.
+
+    ``timeout`` defaults to ``ASYNC_DB_TIMEOUT``. A timed out call raises
+    ``asyncio.TimeoutError``; the query itself still finishes in its
+    thread since the driver cannot be interrupted.
+    """
+    if timeout is None:
+        timeout = AppConfig.ASYNC_DB_TIMEOUT
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+    if timeout:
+        return await asyncio.wait_for(future, timeout)
+    return await future
+
+
+class AsyncUser:
+    """Async counterparts of the User model operations."""
+
+    @staticmethod
+    async def create(name: str, email: str, password: str, image_path: str = None,
+                     timeout: Optional[float] = None) -> User:
+        """Create a new user."""
+        return await run_in_pool(User.create, name, email, password, image_path, timeout=timeout)
+
+    @staticmethod
+    async def find_by_id(user_id: int, timeout: Optional[float] = None) -> Optional[User]:
+        """Find user by ID."""
+        return await run_in_pool(User.find_by_id, user_id, timeout=timeout)
+
+    @staticmethod
+    async def find_by_email(email: str, timeout: Optional[float] = None) -> Optional[User]:
+        """Find user by email."""
+        return await run_in_pool(User.find_by_email, email, timeout=timeout)
+
+    @staticmethod
+    async def all(timeout: Optional[float] = None) -> List[User]:
+        """Get all users."""
+        return await run_in_pool(User.all, timeout=timeout)
+
+    @staticmethod
+    async def count(timeout: Optional[float] = None) -> int:
+        """Count users."""
+        return await run_in_pool(User.count, timeout=timeout)
+
+    @staticmethod
+    async def update(user: User, timeout: Optional[float] = None, **fields) -> bool:
+        """Update user information."""
+        return await run_in_pool(user.update, timeout=timeout, **fields)
+
+    @staticmethod
+    async def delete(user: User, timeout: Optional[float] = None) -> bool:
+        """Delete user."""
+        return await run_in_pool(user.delete, timeout=timeout)
+
+    @staticmethod
+    async def gather(*queries: Awaitable, limit: Optional[int] = None,
+                     return_exceptions: bool = False) -> List[Any]:
+        """Run independent queries concurrently, at most ``limit`` at a time.
+
+        Results are returned in the order the queries were given. ``limit``
+        defaults to ``ASYNC_DB_WORKERS``.
+        """
+        semaphore = asyncio.Semaphore(limit or AppConfig.ASYNC_DB_WORKERS)
+
+        async def bounded(query):
+            async with semaphore:
+                return await query
+
+        return await asyncio.gather(
+            *(bounded(query) for query in queries),
+            return_exceptions=return_exceptions,
+        )
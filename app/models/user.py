@@ -106,6 +106,19 @@ class User:
             cursor.close()
             connection.close()
     
+    @classmethod
+    def count(cls) -> int:
+        """Count users."""
+        connection = cls.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("SELECT COUNT(*) FROM `users`")
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+            connection.close()
+    
     def update(self, name: str = None, email: str = None, password: str = None, image_path: str = None) -> bool:
         """Update user information."""
         connection = self.get_connection()
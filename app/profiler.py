@@ -0,0 +1,221 @@
+"""
+Sampling profiler for individual requests.
+
+Profiled requests are sampled by a background thread that periodically
+captures the request thread's Python stack. Results are written as
+collapsed stacks (one ``frame;frame;frame count`` line per unique stack),
+which can be fed directly to flamegraph.pl, speedscope or inferno.
+"""
+
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+from werkzeug.utils import secure_filename
+
+
+def format_frame(frame) -> str:
+    """Format a stack frame as a collapsed-stack entry."""
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ':')
+
+
+class StackSampler(threading.Thread):
+    """Background thread that samples the stack of another thread."""
+
+    def __init__(self, target_thread_id: int, interval: float, on_finish=None):
+        super().__init__(name="request-profiler", daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.on_finish = on_finish
+        self.stacks = Counter()
+        self.started_at = None
+        self.duration = 0.0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        self.started_at = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+        self.duration = time.perf_counter() - self.started_at
+
+        # Results are written from the sampler thread so the request
+        # thread never waits on disk I/O.
+        if self.on_finish:
+            self.on_finish(self)
+
+    def sample(self):
+        """Record the current stack of the target thread."""
+        frame = sys._current_frames().get(self.target_thread_id)
+        if frame is None:
+            return
+
+        stack = []
+        while frame is not None:
+            stack.append(format_frame(frame))
+            frame = frame.f_back
+        stack.reverse()
+        self.stacks[';'.join(stack)] += 1
+
+    def stop(self):
+        """Stop sampling; results are written asynchronously."""
+        self._stop_event.set()
+
+
+class RequestProfiler:
+    """Opt-in per-request profiler writing collapsed-stack output."""
+
+    header_name = "X-Profile"
+    query_param = "__profile"
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.token = ""
+        self.interval = 0.005
+        self.output_dir = "profiles"
+        self.keep = 20
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read configuration and register request hooks when enabled."""
+        self.enabled = bool(app.config.get('PROFILER_ENABLED', False))
+        self.sample_rate = float(app.config.get('PROFILER_SAMPLE_RATE', 0.0))
+        self.token = app.config.get('PROFILER_TOKEN', "") or ""
+        self.interval = float(app.config.get('PROFILER_INTERVAL', 0.005))
+        self.output_dir = app.config.get('PROFILER_DIR', "profiles")
+        self.keep = int(app.config.get('PROFILER_KEEP', 20))
+
+        # Hooks are only installed when enabled, so a disabled profiler
+        # costs nothing per request.
+        if self.enabled:
+            app.before_request(self._start_profile)
+            app.teardown_request(self._stop_profile)
+
+    def should_profile(self, request) -> bool:
+        """Decide whether the current request should be profiled."""
+        if self.token:
+            supplied = request.headers.get(self.header_name) or request.args.get(self.query_param)
+            # Constant-time comparison so the token can't be guessed by timing.
+            if supplied and hmac.compare_digest(supplied.encode(), self.token.encode()):
+                return True
+
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _start_profile(self):
+        """Start sampling the current request thread if selected."""
+        from flask import g, request
+
+        if not self.should_profile(request):
+            return
+
+        route = request.endpoint or "_unmatched"
+        sampler = StackSampler(
+            threading.get_ident(),
+            self.interval,
+            on_finish=lambda finished: self.save(route, finished),
+        )
+        g._profiler_sampler = sampler
+        sampler.start()
+
+    def _stop_profile(self, exc=None):
+        """Stop the sampler attached to the current request, if any."""
+        from flask import g
+
+        sampler = g.pop('_profiler_sampler', None)
+        if sampler is not None:
+            sampler.stop()
+
+    def route_dir(self, route: str) -> str:
+        """Directory holding profiles for a route."""
+        return os.path.join(self.output_dir, secure_filename(route) or "_unmatched")
+
+    def save(self, route: str, sampler: StackSampler) -> Optional[str]:
+        """Write a finished sampler's stacks and prune old profiles."""
+        if not sampler.stacks:
+            return None
+
+        directory = self.route_dir(route)
+        os.makedirs(directory, exist_ok=True)
+
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        duration_ms = int(sampler.duration * 1000)
+        filename = f"{timestamp}_{duration_ms}ms_{uuid.uuid4().hex[:8]}.folded"
+        path = os.path.join(directory, filename)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            for stack, count in sampler.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+        os.replace(tmp_path, path)
+
+        self.prune(directory)
+        return path
+
+    def prune(self, directory: str):
+        """Keep only the most recent profiles in a route directory."""
+        profiles = sorted(
+            (name for name in os.listdir(directory) if name.endswith(".folded")),
+            reverse=True,
+        )
+        for name in profiles[self.keep:]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    def recent_profiles(self) -> Dict[str, List[Dict]]:
+        """List recent profiles grouped by route, newest first."""
+        profiles = {}
+        if not os.path.isdir(self.output_dir):
+            return profiles
+
+        for route in sorted(os.listdir(self.output_dir)):
+            directory = os.path.join(self.output_dir, route)
+            if not os.path.isdir(directory):
+                continue
+
+            entries = []
+            for name in sorted(os.listdir(directory), reverse=True):
+                if not name.endswith(".folded"):
+                    continue
+                path = os.path.join(directory, name)
+                parts = name[:-len(".folded")].split("_")
+                try:
+                    created_at = datetime.fromtimestamp(os.path.getmtime(path))
+                    samples = self.count_samples(path)
+                except OSError:
+                    # Pruned by a sampler thread since it was listed.
+                    continue
+                entries.append({
+                    'route': route,
+                    'filename': name,
+                    'created_at': created_at,
+                    'duration': parts[1] if len(parts) == 3 else "",
+                    'samples': samples,
+                })
+
+            if entries:
+                profiles[route] = entries
+
+        return profiles
+
+    @staticmethod
+    def count_samples(path: str) -> int:
+        """Total number of samples recorded in a profile file."""
+        total = 0
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                _, _, count = line.rstrip("\n").rpartition(" ")
+                if count.isdigit():
+                    total += int(count)
+        return total
@@ -0,0 +1,343 @@
+"""
+Pre-forking production server for the Flask application.
+
+The master process runs migrations and builds the application, binds the
+listening socket and then forks worker processes. Each worker serves
+requests from the shared socket with a thread per request. Workers are
+recycled after a configurable number of requests, and the master replaces
+them on SIGHUP without dropping in-flight requests.
+
+Signals handled by the master:
+
+- ``SIGHUP``: re-import the application code and rebuild the app, then start
+  a fresh set of workers and gracefully stop the old ones. ``before_fork``
+  (migrations) only runs at startup, so a long migration never stalls
+  supervision of the running workers.
+- ``SIGTERM`` / ``SIGINT``: gracefully stop all workers and exit
+- ``SIGTTIN`` / ``SIGTTOU``: add or remove one worker
+"""
+
+import importlib
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+
+MASTER_SIGNALS = (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGTTIN, signal.SIGTTOU)
+
+
+class WorkerRequestHandler(WSGIRequestHandler):
+    """Request handler with keep-alive and an idle connection timeout."""
+
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections are dropped after this many seconds so
+    # a stopping worker is not held open by clients that never hang up.
+    timeout = 5
+
+
+class RequestLimitMiddleware:
+    """WSGI middleware that asks the worker to stop after N requests."""
+
+    def __init__(self, app, max_requests, on_limit):
+        self.app = app
+        self.max_requests = max_requests
+        self.on_limit = on_limit
+        self.handled = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        if self.max_requests:
+            with self._lock:
+                self.handled += 1
+                reached = self.handled == self.max_requests
+            if reached:
+                self.on_limit()
+        return self.app(environ, start_response)
+
+
+class PreforkServer:
+    """Master process managing a pool of pre-forked worker processes.
+
+    ``app_factory`` is an import path such as ``"app:create_app"`` so the
+    application can be re-imported on reload.
+    """
+
+    def __init__(self, app_factory, host="127.0.0.1", port=8000, workers=None,
+                 max_requests=1000, max_requests_jitter=0, graceful_timeout=30,
+                 before_fork=None):
+        self.app_factory = app_factory
+        self.host = host
+        self.port = port
+        self.num_workers = workers or os.cpu_count() or 1
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.before_fork = before_fork
+
+        self.app = None
+        self.project_root = None
+        self.socket = None
+        self.workers = {}  # pid -> generation
+        self.generation = 0
+        self._signals = []
+
+    def log(self, message):
+        """Write a master/worker log line."""
+        print(f"[{os.getpid()}] {message}", file=sys.stderr, flush=True)
+
+    # Master
+
+    def bind(self):
+        """Create the listening socket shared by all workers."""
+        family = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(socket.SOMAXCONN)
+        # Workers race to accept from the same socket; non-blocking accepts
+        # keep a losing worker from stalling in accept() during shutdown.
+        sock.setblocking(False)
+        sock.set_inheritable(True)
+        self.socket = sock
+        self.port = sock.getsockname()[1]
+
+    def run(self):
+        """Prepare the application, fork workers and supervise them."""
+        if self.before_fork:
+            self.before_fork()
+        self.load_app()
+        self.bind()
+
+        for sig in MASTER_SIGNALS:
+            signal.signal(sig, self._queue_signal)
+
+        self.log(f"Listening on http://{self.host}:{self.port} with {self.num_workers} workers")
+        self.spawn_workers()
+
+        try:
+            while True:
+                self.reap_workers()
+
+                while self._signals:
+                    sig = self._signals.pop(0)
+                    if sig in (signal.SIGTERM, signal.SIGINT):
+                        self.log("Shutting down")
+                        return
+                    if sig == signal.SIGHUP:
+                        self.reload()
+                    elif sig == signal.SIGTTIN:
+                        self.num_workers += 1
+                    elif sig == signal.SIGTTOU and self.num_workers > 1:
+                        self.num_workers -= 1
+
+                self.manage_workers()
+                time.sleep(0.5)
+        finally:
+            self.stop()
+            self.socket.close()
+
+    def load_app(self):
+        """Import the application factory and build the app in the master."""
+        module_name, _, attr = self.app_factory.partition(':')
+        module = importlib.import_module(module_name)
+        if self.project_root is None:
+            # Modules under the project directory are re-imported on reload.
+            package_file = os.path.abspath(sys.modules[module_name.split('.')[0]].__file__)
+            root = os.path.dirname(package_file)
+            if os.path.basename(package_file) == '__init__.py':
+                root = os.path.dirname(root)
+            self.project_root = root
+        self.app = getattr(module, attr)()
+
+    def unload_project_modules(self):
+        """Drop project modules from sys.modules so they are re-imported."""
+        prefix = self.project_root + os.sep
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, '__file__', None)
+            if name in ('__main__', __name__) or not path:
+                continue
+            path = os.path.abspath(path)
+            if path.startswith(prefix) and 'site-packages' not in path:
+                del sys.modules[name]
+
+    def _queue_signal(self, signum, frame):
+        """Record a signal for the supervision loop."""
+        self._signals.append(signum)
+
+    def spawn_workers(self):
+        """Fork workers until the current generation is at full strength."""
+        current = [pid for pid, gen in self.workers.items() if gen == self.generation]
+        for _ in range(self.num_workers - len(current)):
+            self.spawn_worker()
+
+    def spawn_worker(self):
+        """Fork a single worker process."""
+        # Block signals across fork so the child cannot receive one while it
+        # still runs the master's handlers; the worker unblocks them once its
+        # own handlers are installed.
+        signal.pthread_sigmask(signal.SIG_BLOCK, MASTER_SIGNALS)
+        try:
+            pid = os.fork()
+        except OSError:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, MASTER_SIGNALS)
+            raise
+
+        if pid:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, MASTER_SIGNALS)
+            self.workers[pid] = self.generation
+            return pid
+
+        # Child: never return into the master's loop.
+        status = 0
+        try:
+            Worker(self).run()
+        except SystemExit as exc:
+            status = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            os._exit(status)
+
+    def manage_workers(self):
+        """Replace exited workers and retire surplus ones."""
+        current = sorted(pid for pid, gen in self.workers.items() if gen == self.generation)
+        if len(current) < self.num_workers:
+            self.spawn_workers()
+        for pid in current[self.num_workers:]:
+            self.kill_worker(pid, signal.SIGTERM)
+
+    def reap_workers(self):
+        """Collect exited worker processes."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            if self.workers.pop(pid, None) is not None and os.waitstatus_to_exitcode(status) != 0:
+                self.log(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}")
+
+    def reload(self):
+        """Rebuild the application and replace all workers with a fresh generation."""
+        self.log("Reloading application")
+        saved_modules = dict(sys.modules)
+        saved_app = self.app
+        try:
+            self.unload_project_modules()
+            self.load_app()
+        except Exception:
+            traceback.print_exc()
+            # Keep serving the previous code with a consistent module table.
+            for name in list(sys.modules):
+                if name not in saved_modules:
+                    del sys.modules[name]
+            sys.modules.update(saved_modules)
+            self.app = saved_app
+            self.log("Reload failed, keeping current workers")
+            return
+
+        old = [pid for pid, gen in self.workers.items() if gen == self.generation]
+        self.generation += 1
+        # New workers start accepting before the old ones stop, so the
+        # socket is never left without an accepting process.
+        self.spawn_workers()
+        for pid in old:
+            self.kill_worker(pid, signal.SIGTERM)
+
+    def kill_worker(self, pid, sig):
+        """Send a signal to a worker, ignoring already exited ones."""
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            self.workers.pop(pid, None)
+
+    def stop(self):
+        """Gracefully stop all workers, killing stragglers after the timeout."""
+        for pid in list(self.workers):
+            self.kill_worker(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.workers and time.monotonic() < deadline:
+            self.reap_workers()
+            time.sleep(0.1)
+
+        for pid in list(self.workers):
+            self.kill_worker(pid, signal.SIGKILL)
+        self.reap_workers()
+
+
+class Worker:
+    """A forked worker serving requests with a thread per request."""
+
+    def __init__(self, master):
+        self.master = master
+        self.ppid = os.getppid()
+        self.server = None
+        self._stopping = threading.Event()
+
+        max_requests = master.max_requests
+        if max_requests and master.max_requests_jitter:
+            # Spread recycling so workers don't all restart at once.
+            max_requests += random.randint(0, master.max_requests_jitter)
+        self.max_requests = max_requests
+
+    def run(self):
+        """Serve requests until asked to stop."""
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for sig in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(sig, signal.SIG_DFL)
+        # Blocked by the master around fork(); any pending SIGTERM is
+        # delivered to the handler above from here on.
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, MASTER_SIGNALS)
+
+        app = RequestLimitMiddleware(self.master.app, self.max_requests, self.recycle)
+        self.server = make_server(
+            self.master.host, self.master.port, app,
+            threaded=True, request_handler=WorkerRequestHandler,
+            fd=self.master.socket.fileno(),
+        )
+        # Track request threads so server_close() waits for in-flight requests.
+        self.server.daemon_threads = False
+        self.server.block_on_close = True
+
+        threading.Thread(target=self.watch_master, daemon=True).start()
+
+        if self._stopping.is_set():
+            self.server.server_close()
+            return
+
+        try:
+            self.server.serve_forever(poll_interval=0.5)
+        finally:
+            self.server.server_close()
+
+    def recycle(self):
+        """Stop after reaching the request limit; the master forks a replacement."""
+        self.master.log(f"Worker handled {self.max_requests} requests, recycling")
+        self.stop()
+
+    def stop(self):
+        """Stop accepting connections; in-flight requests still complete."""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        if self.server is None:
+            return
+        # shutdown() blocks until serve_forever() returns, so it must not
+        # run on the thread executing serve_forever() (e.g. a signal handler).
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def watch_master(self):
+        """Exit if the master process goes away."""
+        while not self._stopping.wait(1.0):
+            if os.getppid() != self.ppid:
+                self.stop()
@@ -18,4 +18,47 @@ class AppConfig:
     DB_PASSWORD = ""
     DB_NAME = "pythondb"
 
+    # Request profiler settings. When disabled no request hooks are
+    # registered, so the profiler adds no per-request overhead.
+    PROFILER_ENABLED = False
+    # Fraction of requests (0.0 - 1.0) to profile automatically
+    PROFILER_SAMPLE_RATE = 0.0
+    # Secret that triggers profiling via the X-Profile header or the
+    # ?__profile= query flag; leave empty to disable on-demand profiling
+    PROFILER_TOKEN = ""
+    # Seconds between stack samples
+    PROFILER_INTERVAL = 0.005
+    # Directory for collapsed-stack (.folded) profile files
+    PROFILER_DIR = "profiles"
+    # Number of profiles kept per route
+    PROFILER_KEEP = 20
 
+    # Production server settings (used by serve.py)
+    SERVE_HOST = "127.0.0.1"
+    SERVE_PORT = 8000
+    # Number of worker processes; None uses the CPU core count
+    SERVE_WORKERS = None
+    # Recycle a worker after this many requests (0 disables recycling)
+    SERVE_MAX_REQUESTS = 1000
+    # Random extra requests per worker so recycling is staggered
+    SERVE_MAX_REQUESTS_JITTER = 50
+    # Seconds to wait for in-flight requests when stopping workers
+    SERVE_GRACEFUL_TIMEOUT = 30
+
+    # Online migration settings
+    # Rows per batch for backfills and shadow table copies
+    MIGRATION_BATCH_SIZE = 1000
+    # Seconds to pause between batches
+    MIGRATION_THROTTLE = 0.05
+    # Assumed copy throughput in bytes per second, applied to table row
+    # counts and average row lengths for `migrate.py --dry-run` estimates
+    MIGRATION_BYTES_PER_SECOND = 1024 * 1024
+    # Seconds to wait for another process holding the migrations lock
+    MIGRATION_LOCK_TIMEOUT = 600
+
+    # Async data access settings (app/models/async_user.py)
+    # Threads per process running blocking queries; also the default
+    # concurrency limit for AsyncUser.gather
+    ASYNC_DB_WORKERS = 8
+    # Default per-query timeout in seconds (None disables)
+    ASYNC_DB_TIMEOUT = 10
@@ -1,12 +1,39 @@
 """
 Migration command script.
 Run this to execute database migrations.
+
+    python migrate.py            # run pending migrations
+    python migrate.py --dry-run  # list pending migrations with time estimates
 """
 
+import argparse
+import sys
 from app.migrations.migration_manager import MigrationManager
 
+
+def show_progress(migration, step, done, total):
+    """Render a single-line progress bar for an online migration step."""
+    width = 30
+    ratio = done / total if total else 1.0
+    filled = int(width * ratio)
+    bar = "#" * filled + "-" * (width - filled)
+    sys.stdout.write(f"\r  {step}: [{bar}] {ratio:6.1%} ({done}/{total})")
+    if done >= total:
+        sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
 if __name__ == "__main__":
-    print("Running database migrations...")
+    parser = argparse.ArgumentParser(description="Run database migrations.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="estimate pending migrations without running them")
+    args = parser.parse_args()
+    
     migration_manager = MigrationManager()
-    migration_manager.run_migrations()
-    print("Migrations completed!")
+    if args.dry_run:
+        print("Pending migrations (dry run):")
+        migration_manager.run_migrations(dry_run=True)
+    else:
+        print("Running database migrations...")
+        migration_manager.run_migrations(progress=show_progress)
+        print("Migrations completed!")
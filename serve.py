@@ -0,0 +1,45 @@
+"""
+Production server entry point.
+Runs migrations in the master at startup, then serves the application from
+pre-forked workers. Send SIGHUP to reload code, templates and config without
+downtime; run `python migrate.py` first if the new code needs migrations.
+"""
+
+import argparse
+from app.server import PreforkServer
+from config import AppConfig
+
+
+def run_migrations():
+    """Bring the database schema up to date before forking workers."""
+    from app.migrations.migration_manager import MigrationManager
+    
+    migration_manager = MigrationManager()
+    migration_manager.run_migrations()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the application with pre-forked workers.")
+    parser.add_argument("--host", default=AppConfig.SERVE_HOST)
+    parser.add_argument("--port", type=int, default=AppConfig.SERVE_PORT)
+    parser.add_argument("--workers", type=int, default=AppConfig.SERVE_WORKERS,
+                        help="number of worker processes (default: CPU core count)")
+    parser.add_argument("--max-requests", type=int, default=AppConfig.SERVE_MAX_REQUESTS,
+                        help="recycle a worker after this many requests (0 disables)")
+    parser.add_argument("--max-requests-jitter", type=int, default=AppConfig.SERVE_MAX_REQUESTS_JITTER)
+    parser.add_argument("--graceful-timeout", type=int, default=AppConfig.SERVE_GRACEFUL_TIMEOUT)
+    parser.add_argument("--skip-migrations", action="store_true",
+                        help="do not run migrations before starting")
+    args = parser.parse_args()
+
+    server = PreforkServer(
+        "app:create_app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        graceful_timeout=args.graceful_timeout,
+        before_fork=None if args.skip_migrations else run_migrations,
+    )
+    server.run()